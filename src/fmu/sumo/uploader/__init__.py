@@ -13,6 +13,3 @@ from fmu.sumo.uploader.caseondisk import CaseOnDisk
 from fmu.sumo.uploader.caseonjob import CaseOnJob
 
 SumoConnection = sumo.wrapper.SumoClient
-
-# from fmu.sumo.uploader._fileondisk import FileOnDisk
-# from fmu.sumo.uploader._fileonjob import FileOnJob
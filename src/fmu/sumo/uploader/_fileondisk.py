@@ -6,12 +6,19 @@ pair (technically two files).
 
 """
 
-import base64
-import hashlib
+import datetime
+import json
+import mmap
 import os
 
 import yaml
 
+try:
+    # libyaml tokenizes/parses in C when available
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 from fmu.sumo.uploader._logger import get_uploader_logger
 from fmu.sumo.uploader._sumofile import SumoFile, _path_to_yaml_path
 
@@ -19,23 +26,127 @@ from fmu.sumo.uploader._sumofile import SumoFile, _path_to_yaml_path
 
 logger = get_uploader_logger()
 
+# Files at least this large are memory-mapped instead of read into a
+# bytes object, so the page cache rather than the heap holds the data
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+
+# Opt-out switch for the JSON sidecar cache of parsed yaml metadata
+_METADATA_CACHE_DISABLED = bool(
+    os.environ.get("SUMO_UPLOADER_NO_METADATA_CACHE")
+)
+
+
+def _sanitize_datetimes(data):
+    """Sanitize datetimes.
+
+    Given a dictionary, find and replace all datetime and date objects
+    with isoformat string, so that it does not cause problems for
+    JSON later on.
+
+    The traversal is iterative and mutates containers in place, so
+    deeply nested metadata neither hits the recursion limit nor pays
+    for rebuilding untouched lists and dicts."""
+
+    # datetime.datetime is a subclass of datetime.date, so this covers
+    # both the timestamps and the bare dates yaml parses into objects
+    if isinstance(data, datetime.date):
+        return data.isoformat()
+
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            continue
+        for key, value in items:
+            if isinstance(value, datetime.date):
+                node[key] = value.isoformat()
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
 
-def parse_yaml(path):
-    """From path, parse file as yaml, return data"""
-    with open(path, "r") as stream:
-        data = yaml.safe_load(stream)
     return data
 
 
-def file_to_byte_string(path):
-    """
-    Given an path to a file, read as bytes, return byte string.
-    """
+def _has_string_keys_only(data):
+    """Return True if every dict key in the document is a string.
+
+    json.dump silently coerces int/bool keys to strings instead of
+    raising, so a document with such keys would come back changed from
+    the cache; it must not be cached at all."""
+
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if not isinstance(key, str):
+                    return False
+                if isinstance(value, (dict, list)):
+                    stack.append(value)
+        elif isinstance(node, list):
+            stack.extend(
+                value for value in node if isinstance(value, (dict, list))
+            )
+    return True
+
 
-    with open(path, "rb") as f:
-        byte_string = f.read()
+def parse_yaml(path):
+    """From path, parse file as yaml, return data.
+
+    Timestamps and dates are normalized to isoformat strings — the
+    metadata is shipped as JSON anyway — so the parse result is
+    JSON-representable and identical whether it comes from yaml or
+    from the cache.
+
+    The parsed metadata is cached to a JSON sidecar keyed on the yaml
+    file's (st_mtime_ns, st_size); json.loads is much faster than the
+    yaml parser, so warm re-runs over a case skip yaml entirely. Set
+    SUMO_UPLOADER_NO_METADATA_CACHE to disable the cache."""
+
+    cache_path = os.fspath(path) + ".json"
+    stat = os.stat(path)
+    cache_key = [stat.st_mtime_ns, stat.st_size]
+
+    if not _METADATA_CACHE_DISABLED:
+        try:
+            with open(cache_path, "r") as stream:
+                cached = json.load(stream)
+            # Strict comparison: an equal-mtime rewrite (within the
+            # filesystem's timestamp granularity) usually changes the
+            # size and must not serve the stale document
+            if cached["key"] == cache_key:
+                return cached["data"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    # Binary mode lets libyaml do the UTF-8 decoding in C
+    with open(path, "rb") as stream:
+        data = _sanitize_datetimes(yaml.load(stream, Loader=YamlLoader))
+
+    # Only cache documents that round-trip through JSON unchanged;
+    # non-string keys (plausible in a hand-written global config, e.g.
+    # integer zone numbers) would be coerced to strings by json.dump
+    if not _METADATA_CACHE_DISABLED and _has_string_keys_only(data):
+        # pid-suffixed so concurrent processes do not clobber each
+        # other's half-written file before the atomic replace
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as stream:
+                json.dump({"key": cache_key, "data": data}, stream)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError):
+            # Not JSON-serializable or not writable; skip caching and
+            # leave no partial file behind
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
 
-    return byte_string
+    return data
 
 
 class FileOnDisk(SumoFile):
@@ -53,8 +164,7 @@ class FileOnDisk(SumoFile):
         )
         self.path = os.path.abspath(path)
         self.metadata = parse_yaml(self.metadata_path)
-
-        self._size = os.path.getsize(self.path)
+        self._metadata_size = os.path.getsize(self.metadata_path)
 
         self.basename = os.path.basename(self.path)
         self.dir_name = os.path.dirname(self.path)
@@ -64,14 +174,28 @@ class FileOnDisk(SumoFile):
         self.sumo_object_id = None
         self.sumo_parent_id = None
 
-        self.metadata["_sumo"] = {}
-
-        self.byte_string = file_to_byte_string(path)
-        self.metadata["_sumo"]["blob_size"] = len(self.byte_string)
-        digester = hashlib.md5(self.byte_string)
-        self.metadata["_sumo"]["blob_md5"] = base64.b64encode(
-            digester.digest()
-        ).decode("utf-8")
+        # Read the file once; take the size from the open file
+        # descriptor rather than a separate stat of the path.
+        # Large files are memory-mapped to keep peak RSS bounded.
+        with open(self.path, "rb") as f:
+            self._size = os.fstat(f.fileno()).st_size
+            if self._size >= MMAP_THRESHOLD:
+                self.byte_string = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                )
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    self.byte_string.madvise(mmap.MADV_SEQUENTIAL)
+            else:
+                self.byte_string = f.read()
+        # One literal assignment instead of key-by-key writes;
+        # blob_md5 is added in a batched pass at upload time,
+        # see SumoFile.finalize_hash()
+        self.metadata["_sumo"] = {"blob_size": self._size}
+
+        # Classify once; upload_to_sumo branches on this for both the
+        # metadata and the blob upload
+        data_section = self.metadata.get("data") or {}
+        self._is_seismic = data_section.get("format") in ("openvds", "segy")
 
     def __repr__(self):
         if not self.metadata:
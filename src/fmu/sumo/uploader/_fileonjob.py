@@ -6,9 +6,6 @@ pair (technically two files).
 
 """
 
-import base64
-import hashlib
-
 from fmu.sumo.uploader._logger import get_uploader_logger
 from fmu.sumo.uploader._sumofile import SumoFile
 
@@ -26,16 +23,22 @@ class FileOnJob(SumoFile):
         """
         self.metadata = metadata
         self._size = None
+        self._metadata_size = None
         self._file_format = None
         self.sumo_object_id = None
         self.sumo_parent_id = None
 
-        self.metadata["_sumo"] = {}
-
         self.byte_string = byte_string
-        self.metadata["_sumo"]["blob_size"] = len(self.byte_string)
-        digester = hashlib.md5(self.byte_string)
-        self.metadata["_sumo"]["blob_md5"] = base64.b64encode(
-            digester.digest()
-        ).decode("utf-8")
-        self.metadata["file"]["checksum_md5"] = digester.hexdigest()
+        # One literal assignment instead of key-by-key writes;
+        # blob_md5/checksum_md5 are added in a batched pass at
+        # upload time, see SumoFile.finalize_hash()
+        self.metadata["_sumo"] = {"blob_size": len(byte_string)}
+
+        # Classify once; upload_to_sumo branches on this for both the
+        # metadata and the blob upload
+        data_section = self.metadata.get("data") or {}
+        self._is_seismic = data_section.get("format") in ("openvds", "segy")
+
+    def finalize_hash(self, digest):
+        super().finalize_hash(digest)
+        self.metadata["file"]["checksum_md5"] = digest.hex()
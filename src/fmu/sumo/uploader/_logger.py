@@ -2,10 +2,9 @@ import logging
 import sys
 
 
-# def getLogger(module_name="subscript"):
-def get_uploader_logger():
+def _build_logger():
     # pylint: disable=invalid-name
-    """Provides a unified logger for fmu-sumo-uploader.
+    """Build the unified logger for fmu-sumo-uploader.
 
     Code is copied from
     https://github.com/equinor/subscript/blob/main/src/subscript/__init__.py
@@ -37,3 +36,12 @@ def get_uploader_logger():
         logger.addHandler(stderr_handler)
 
     return logger
+
+
+# Handlers are installed exactly once, at import time
+_LOGGER = _build_logger()
+
+
+def get_uploader_logger():
+    """Return the unified, already configured fmu-sumo-uploader logger."""
+    return _LOGGER
@@ -4,18 +4,25 @@ Base class for CaseOnJob and CaseOnDisk classes.
 
 """
 
-import datetime
-import statistics
+import logging
 import time
 import warnings
 
+from fmu.sumo.uploader._fileondisk import _sanitize_datetimes
 from fmu.sumo.uploader._logger import get_uploader_logger
-from fmu.sumo.uploader._upload_files import upload_files
+from fmu.sumo.uploader._md5_batch import batch_md5
+from fmu.sumo.uploader._upload_files import (
+    prefetch_parameter_uploads,
+    upload_files,
+)
 
 # pylint: disable=C0103 # allow non-snake case variable names
 
 logger = get_uploader_logger()
 
+# Total number of upload passes for files that fail transiently
+MAX_UPLOAD_ATTEMPTS = 3
+
 
 class SumoCase:
     def __init__(
@@ -38,38 +45,68 @@ class SumoCase:
         logger.debug("self._sumo_parent_id is %s", self._sumo_parent_id)
         self._files = []
         self.sumo_mode = sumo_mode
+        self._case_client = None
+        # Reused as the extra dict for every log call towards Sumo
+        self._log_extra = {"objectUuid": self._sumo_parent_id}
 
         return
 
     def _get_fmu_case_uuid(self):
         """Return case_id from case_metadata."""
-        fmu_case_uuid = None
+        # Direct indexing with a narrow except is cheaper than the
+        # chained .get() calls and cannot hide unrelated errors
         try:
-            if (
-                self.case_metadata
-                and self.case_metadata.get("fmu")
-                and self.case_metadata.get("fmu").get("case")
-            ):
-                fmu_case_uuid = (
-                    self.case_metadata.get("fmu").get("case").get("uuid")
-                )
-            if not fmu_case_uuid:
-                err_msg = "Invalid metadata: Could not get fmu.case.uuid from case metadata"
-                warnings.warn(err_msg)
-                return None
-            else:
-                return fmu_case_uuid
-        except Exception as err:
-            err_msg = f"Invalid metadata: Could not get fmu.case.uuid from case metadata: {err} {type(err)}"
+            fmu_case_uuid = self.case_metadata["fmu"]["case"]["uuid"]
+        except (KeyError, TypeError):
+            fmu_case_uuid = None
+        if not fmu_case_uuid:
+            err_msg = "Invalid metadata: Could not get fmu.case.uuid from case metadata"
             warnings.warn(err_msg)
             return None
+        return fmu_case_uuid
+
+    def _log_problem_uploads(self, kind, uploads):
+        """Log the first few rejected/failed uploads, locally and to Sumo.
+
+        kind is the result status being reported ("rejected" or
+        "failed")."""
+
+        logger.info(
+            f"\n\n{len(uploads)} files {kind} by Sumo. First 5 {kind} files:"
+        )
 
-    def upload(self, threads=4):
+        # Check the handler level once; _get_log_msg builds a nested
+        # dict per record, which is wasted if the message is dropped
+        sumo_info_enabled = self._sumo_logger.isEnabledFor(logging.INFO)
+
+        for u in uploads[0:4]:
+            # Look each field up once; they are reused below
+            filepath = u.get("blob_file_path")
+            metadata_code = u.get("metadata_upload_response_status_code")
+            metadata_text = u.get("metadata_upload_response_text")
+            blob_code = u.get("blob_upload_response_status_code")
+            blob_text = u.get("blob_upload_response_status_text")
+
+            logger.info("\n" + "=" * 50)
+            logger.info(f"Filepath: {filepath}")
+            logger.info(f"Metadata: [{metadata_code}] {metadata_text}")
+            logger.info(f"Blob: [{blob_code}] {blob_text}")
+            if sumo_info_enabled:
+                self._sumo_logger.info(
+                    _get_log_msg(self.sumo_parent_id, u),
+                    extra=self._log_extra,
+                )
+
+    def upload(self, threads=8):
         """Trigger upload of files.
 
         Upload all indexed files. Collect the files that have been uploaded OK, the
         ones that have failed and the ones that have been rejected.
 
+        The workload is network-bound: worker threads sit in blocking
+        HTTPS round-trips with the GIL released, so concurrency — not
+        CPU — sets the throughput.
+
         Retry the failed uploads X times."""
 
         if not self.files:
@@ -80,13 +117,52 @@ class SumoCase:
         ok_uploads = []
         failed_uploads = []
         rejected_uploads = []
-        files_to_upload = list(self.files)
-
-        _t0 = time.perf_counter()
+        # A released payload marks a file already uploaded by an
+        # earlier pass; rehashing it would overwrite blob_md5 with the
+        # digest of nothing and resend an empty blob
+        files_to_upload = [
+            file for file in self.files if file.byte_string is not None
+        ]
+        if not files_to_upload:
+            logger.info("All files were uploaded by an earlier pass.")
+            return []
+
+        _t0 = time.perf_counter_ns()
 
         logger.debug("files_to_upload: %s", files_to_upload)
 
-        sumoclient = self.sumoclient.client_for_case(self._sumo_parent_id)
+        # Compute checksums for all files in one batched pass
+        digests = batch_md5([f.byte_string for f in files_to_upload])
+        for file, digest in zip(files_to_upload, digests):
+            file.finalize_hash(digest)
+
+        # Build the case-scoped client once and keep it; its connection
+        # pool is then reused across upload passes instead of paying
+        # fresh TLS handshakes per call
+        if self._case_client is None:
+            self._case_client = self.sumoclient.client_for_case(
+                self._sumo_parent_id
+            )
+        sumoclient = self._case_client
+
+        # When the batch spans several realizations, one search warms
+        # the parameters cache for all of them; with a single
+        # realization the per-realization check in upload_files is the
+        # same one round trip, so prefetching would only add a query
+        realization_ids = {
+            file.metadata["fmu"]["realization"]["uuid"]
+            for file in files_to_upload
+            if "fmu" in file.metadata and "realization" in file.metadata["fmu"]
+        }
+        if len(realization_ids) > 1:
+            try:
+                prefetch_parameter_uploads(
+                    sumoclient,
+                    self._sumo_parent_id,
+                    sorted(realization_ids),
+                )
+            except Exception as err:
+                logger.warning("Could not prefetch parameter uploads: %s", err)
 
         upload_results = upload_files(
             files_to_upload,
@@ -102,6 +178,34 @@ class SumoCase:
         rejected_uploads += upload_results.get("rejected_uploads")
         failed_uploads = upload_results.get("failed_uploads")
 
+        # Retry transiently failed uploads on the same connection pool.
+        # Rejected uploads are final and are not retried.
+        attempts = 1
+        while failed_uploads and attempts < MAX_UPLOAD_ATTEMPTS:
+            attempts += 1
+            retry_files = [res.get("file") for res in failed_uploads]
+            logger.info(
+                "Retrying %s failed uploads, attempt %s of %s",
+                len(retry_files),
+                attempts,
+                MAX_UPLOAD_ATTEMPTS,
+            )
+            upload_results = upload_files(
+                retry_files,
+                self._sumo_parent_id,
+                sumoclient,
+                threads,
+                self.sumo_mode,
+                self.config_path,
+                self.parameters_path,
+                # Parameters were handled on the first pass; a failed
+                # parameters file is retried as a file in retry_files
+                skip_parameters=True,
+            )
+            ok_uploads += upload_results.get("ok_uploads")
+            rejected_uploads += upload_results.get("rejected_uploads")
+            failed_uploads = upload_results.get("failed_uploads")
+
         if rejected_uploads and any(
             res.get("metadata_upload_response_status_code") in [404]
             for res in rejected_uploads
@@ -117,7 +221,7 @@ class SumoCase:
                 "register=True. This should not be done in the FMU context."
             )
 
-        _dt = time.perf_counter() - _t0
+        _dt = (time.perf_counter_ns() - _t0) / 1e9
 
         upload_statistics = ""
         if len(ok_uploads) > 0:
@@ -125,48 +229,10 @@ class SumoCase:
             logger.info(upload_statistics)
 
         if rejected_uploads:
-            logger.info(
-                f"\n\n{len(rejected_uploads)} files rejected by Sumo. First 5 rejected files:"
-            )
-
-            for u in rejected_uploads[0:4]:
-                logger.info("\n" + "=" * 50)
-
-                logger.info(f"Filepath: {u.get('blob_file_path')}")
-                logger.info(
-                    f"Metadata: [{u.get('metadata_upload_response_status_code')}] "
-                    f"{u.get('metadata_upload_response_text')}"
-                )
-                logger.info(
-                    f"Blob: [{u.get('blob_upload_response_status_code')}] "
-                    f"{u.get('blob_upload_response_status_text')}"
-                )
-                self._sumo_logger.info(
-                    _get_log_msg(self.sumo_parent_id, u),
-                    extra={"objectUuid": self._sumo_parent_id},
-                )
+            self._log_problem_uploads("rejected", rejected_uploads)
 
         if failed_uploads:
-            logger.info(
-                f"\n\n{len(failed_uploads)} files failed by Sumo. First 5 failed files:"
-            )
-
-            for u in failed_uploads[0:4]:
-                logger.info("\n" + "=" * 50)
-
-                logger.info(f"Filepath: {u.get('blob_file_path')}")
-                logger.info(
-                    f"Metadata: [{u.get('metadata_upload_response_status_code')}] "
-                    f"{u.get('metadata_upload_response_text')}"
-                )
-                logger.info(
-                    f"Blob: [{u.get('blob_upload_response_status_code')}] "
-                    f"{u.get('blob_upload_response_status_text')}"
-                )
-                self._sumo_logger.info(
-                    _get_log_msg(self.sumo_parent_id, u),
-                    extra={"objectUuid": self._sumo_parent_id},
-                )
+            self._log_problem_uploads("failed", failed_uploads)
 
         logger.info("Summary:")
         logger.info("Total files count: %s", str(len(self.files)))
@@ -188,9 +254,7 @@ class SumoCase:
                 "sumo_mode": self.sumo_mode,
             }
         }
-        self._sumo_logger.info(
-            str(summary), extra={"objectUuid": self._sumo_parent_id}
-        )
+        self._sumo_logger.info(str(summary), extra=self._log_extra)
 
         return ok_uploads
 
@@ -229,17 +293,39 @@ def _calculate_upload_stats(uploads):
     Given a list of results from file upload, calculate and return
     timing statistics for uploads."""
 
-    blob_upload_times = [u["blob_upload_time_elapsed"] for u in uploads]
-    metadata_upload_times = [
-        u["metadata_upload_time_elapsed"] for u in uploads
-    ]
+    # Deferred import; only runs when at least one upload succeeded
+    import statistics
+
+    # Collect both series in a single traversal of the results
+    blob_upload_times = []
+    metadata_upload_times = []
+    for u in uploads:
+        blob_upload_times.append(u["blob_upload_time_elapsed"])
+        metadata_upload_times.append(u["metadata_upload_time_elapsed"])
 
     def _get_stats(values):
+        if len(values) > 1:
+            # Tail latencies say more about upload health than the mean
+            percentiles = statistics.quantiles(
+                values, n=100, method="inclusive"
+            )
+            p50, p95, p99 = (
+                percentiles[49],
+                percentiles[94],
+                percentiles[98],
+            )
+            std = statistics.stdev(values)
+        else:
+            p50 = p95 = p99 = values[0]
+            std = 0.0
         return {
-            "mean": statistics.mean(values),
+            "mean": statistics.fmean(values),
             "max": max(values),
             "min": min(values),
-            "std": statistics.stdev(values) if len(values) > 1 else 0.0,
+            "std": std,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
         }
 
     stats = {
@@ -252,23 +338,3 @@ def _calculate_upload_stats(uploads):
     }
 
     return stats
-
-
-def _sanitize_datetimes(data):
-    """Sanitize datetimes.
-
-    Given a dictionary, find and replace all datetime objects
-    with isoformat string, so that it does not cause problems for
-    JSON later on."""
-
-    if isinstance(data, datetime.datetime):
-        return data.isoformat()
-
-    if isinstance(data, dict):
-        for key in data:
-            data[key] = _sanitize_datetimes(data[key])
-
-    elif isinstance(data, list):
-        data = [_sanitize_datetimes(element) for element in data]
-
-    return data
@@ -4,13 +4,18 @@ Base class for FileOnJob and FileOnDisk classes.
 
 """
 
+import binascii
+import functools
+import hashlib
+import mmap
 import os
-import subprocess
 import sys
+import threading
 import time
 import warnings
 
 import httpx
+from azure.core.pipeline.transport import RequestsTransport
 from azure.storage.blob import BlobClient, ContentSettings
 
 from fmu.sumo.uploader._logger import get_uploader_logger
@@ -19,22 +24,29 @@ from fmu.sumo.uploader._logger import get_uploader_logger
 
 logger = get_uploader_logger()
 
+# The platform never changes at runtime; check it once
+_IS_WINDOWS = sys.platform.startswith("win")
+_IS_DARWIN = sys.platform.startswith("darwin")
 
-def _get_segyimport_cmdstr(blob_url, object_id, file_path, sample_unit):
-    """Return the command string for running OpenVDS SEGYImport"""
-    try:
-        url = "azureSAS:" + blob_url["baseuri"][6:]
-        url_conn = "Suffix=?" + blob_url["auth"]
-    except KeyError:
-        url = (
-            "azureSAS" + blob_url.split(object_id)[0][5:]
-        )  # SEGYImport expects url to container
-        url_conn = "Suffix=?" + blob_url.split("?")[1]
+# One shared transport for all blob clients, so uploads reuse a
+# keep-alive connection pool instead of doing a TLS handshake per file
+_BLOB_TRANSPORT = RequestsTransport()
 
-    persistent_id = object_id
+# SEGYImport conversions are CPU-bound external processes; cap how
+# many run at once to the core count so a SEGY-heavy case does not
+# oversubscribe the machine while other workers upload plain blobs
+_SEGY_SEMAPHORE = threading.BoundedSemaphore(os.cpu_count() or 2)
+
+
+@functools.cache
+def _find_segyimport_executable():
+    """Locate the OpenVDS SEGYImport executable.
+
+    Cached so the per-location stat probing (expensive on network
+    filesystems) runs once per process, not once per SEGY file."""
 
     segy_command = "SEGYImport"
-    if sys.platform.startswith("win"):
+    if _IS_WINDOWS:
         segy_command = segy_command + ".exe"
     python_path = os.path.dirname(sys.executable)
     # The SEGYImport folder location is not fixed
@@ -45,15 +57,29 @@ def _get_segyimport_cmdstr(blob_url, object_id, file_path, sample_unit):
         "/home/vscode/.local/bin",
         "/usr/local/bin",
     ]
-    path_to_executable = None
     for loc in locations:
         path = os.path.join(loc, segy_command)
         if os.path.isfile(path):
-            path_to_executable = path
-            break
-    if path_to_executable is None:
-        logger.error("Could not find OpenVDS executables folder location")
-    logger.info("Path to OpenVDS executable: " + path_to_executable)
+            logger.info("Path to OpenVDS executable: " + path)
+            return path
+    logger.error("Could not find OpenVDS executables folder location")
+    return None
+
+
+def _get_segyimport_cmdstr(blob_url, object_id, file_path, sample_unit):
+    """Return the command string for running OpenVDS SEGYImport"""
+    try:
+        url = "azureSAS:" + blob_url["baseuri"][6:]
+        url_conn = "Suffix=?" + blob_url["auth"]
+    except KeyError:
+        url = (
+            "azureSAS" + blob_url.split(object_id)[0][5:]
+        )  # SEGYImport expects url to container
+        url_conn = "Suffix=?" + blob_url.split("?")[1]
+
+    persistent_id = object_id
+
+    path_to_executable = _find_segyimport_executable()
 
     cmdstr = [
         path_to_executable,
@@ -79,22 +105,70 @@ class SumoFile:
     def __init__(self):
         return
 
+    def finalize_hash(self, digest):
+        """Populate checksum metadata from a raw MD5 digest.
+
+        Hashing is deferred out of __init__ so that digests for many
+        files can be computed in one batched pass before upload."""
+        # b2a_base64 is a one-shot C call, cheaper than base64.b64encode
+        self.metadata["_sumo"]["blob_md5"] = binascii.b2a_base64(
+            digest, newline=False
+        ).decode("ascii")
+        # Kept raw for the blob upload's Content-MD5 header
+        self._md5_digest = digest
+
+    def _release_byte_string(self):
+        """Drop the payload once the blob is safely on Sumo.
+
+        The result records keep the file objects alive until the whole
+        batch has been reported, so holding every payload as well would
+        put peak memory at the sum of all blob sizes.
+
+        None doubles as the uploaded-marker: a later upload() pass on
+        the same case skips files whose payload has been released
+        instead of rehashing and resending an empty body."""
+        byte_string = self.byte_string
+        if isinstance(byte_string, mmap.mmap):
+            byte_string.close()
+        self.byte_string = None
+
     def _upload_metadata(self, sumoclient, sumo_parent_id):
         path = f"/objects('{sumo_parent_id}')"
         response = sumoclient.post(path=path, json=self.metadata)
         return response
 
     def _upload_byte_string(self, blob_url):
-        blobclient = BlobClient.from_blob_url(blob_url)
+        blobclient = BlobClient.from_blob_url(
+            blob_url, transport=_BLOB_TRANSPORT
+        )
+        # Reuse the digest computed in the batched hashing pass; the
+        # SDK would otherwise leave Content-MD5 unset, and hashing here
+        # would serialize with the upload
         content_settings = ContentSettings(
-            content_type="application/octet-stream"
+            content_type="application/octet-stream",
+            content_md5=getattr(self, "_md5_digest", None),
         )
+        byte_string = self.byte_string
+        if hasattr(byte_string, "seek"):
+            # mmap-backed payloads are streamed by the SDK in chunks;
+            # rewind in case an earlier attempt moved the position
+            byte_string.seek(0)
+        length = len(byte_string)
+        # Blobs above the SDK's single-put limit are sent as blocks;
+        # parallel block PUTs hide the per-chunk round-trip latency.
+        # Small blobs go in one request, where extra workers cost more
+        # than they save.
+        if length >= 64 * 1024 * 1024:
+            max_concurrency = min(8, length // (8 * 1024 * 1024))
+        else:
+            max_concurrency = 1
         blobclient.upload_blob(
-            self.byte_string,
+            byte_string,
             blob_type="BlockBlob",
-            length=len(self.byte_string),
+            length=length,
             overwrite=True,
             content_settings=content_settings,
+            max_concurrency=max_concurrency,
         )
         # response has the form {'etag': '"0x8DCDC8EED1510CC"', 'last_modified': datetime.datetime(2024, 9, 24, 11, 49, 20, tzinfo=datetime.timezone.utc), 'content_md5': bytearray(b'\x1bPM3(\xe1o\xdf(\x1d\x1f\xb9Qm\xd9\x0b'), 'client_request_id': '08c962a4-7a6b-11ef-8710-acde48001122', 'request_id': 'f459ad2b-801e-007d-1977-0ef6ee000000', 'version': '2024-11-04', 'version_id': None, 'date': datetime.datetime(2024, 9, 24, 11, 49, 19, tzinfo=datetime.timezone.utc), 'request_server_encrypted': True, 'encryption_key_sha256': None, 'encryption_scope': None}
         # ... which is not what the caller expects, so we return something reasonable.
@@ -108,8 +182,20 @@ class SumoFile:
 
     def upload_to_sumo(self, sumo_parent_id, sumoclient, sumo_mode):
         """Upload this file to Sumo"""
+        # Hash is normally computed batched over all files before
+        # upload; compute it here if this file was uploaded directly.
+        if "blob_md5" not in self.metadata["_sumo"]:
+            self.finalize_hash(
+                hashlib.md5(self.byte_string, usedforsecurity=False).digest()
+            )
+
         # We need these included even if returning before blob upload
-        result = {"blob_file_path": self.path, "blob_file_size": self._size}
+        blob_file_path = self.path
+        blob_file_size = self._size
+        result = {
+            "blob_file_path": blob_file_path,
+            "blob_file_size": blob_file_size,
+        }
 
         if not sumo_parent_id:
             err_msg = f"File upload cannot be attempted, missing case/sumo_parent_id. Got: {sumo_parent_id}"
@@ -122,14 +208,13 @@ class SumoFile:
             )
             return result
 
-        _t0_metadata = time.perf_counter()
+        _t0_metadata = time.perf_counter_ns()
+
+        # Classified once at construction; see the subclass __init__s
+        is_seismic = self._is_seismic
 
         # Uploader converts segy-files to OpenVDS:
-        if (
-            self.metadata.get("data")
-            and self.metadata.get("data").get("format")
-            and self.metadata.get("data").get("format") in ["openvds", "segy"]
-        ):
+        if is_seismic:
             self.metadata["data"]["format"] = "openvds"
             if "vertical_domain" not in self.metadata["data"]:
                 result.update(
@@ -141,30 +226,15 @@ class SumoFile:
                 )
                 return result
 
+        # Keep only the POST itself inside the try; the success-path
+        # bookkeeping lives in the else branch below
         try:
             response = self._upload_metadata(
                 sumoclient=sumoclient, sumo_parent_id=sumo_parent_id
             )
-
-            _t1_metadata = time.perf_counter()
-
-            result.update(
-                {
-                    "metadata_upload_response_status_code": response.status_code,
-                    "metadata_upload_response_text": response.text,
-                    "metadata_upload_time_start": _t0_metadata,
-                    "metadata_upload_time_end": _t1_metadata,
-                    "metadata_upload_time_elapsed": _t1_metadata
-                    - _t0_metadata,
-                    "metadata_file_path": self.metadata_path,
-                    "metadata_file_size": self._size,
-                }
-            )
-            pass
         except (httpx.TimeoutException, httpx.ConnectError) as err:
-            err = err.with_traceback(None)
             logger.warning(
-                f"Metadata upload timeout/connection exception {err} {type(err)}"
+                "Metadata upload timeout/connection exception: %r", err
             )
             result.update(
                 {
@@ -173,16 +243,14 @@ class SumoFile:
                     "metadata_upload_response_text": str(err),
                 }
             )
-            pass
         except httpx.HTTPStatusError as err:
-            err = err.with_traceback(None)
             error_string = (
                 str(err.response.status_code)
                 + err.response.reason_phrase
                 + err.response.text
             )
             logger.warning(
-                f"Metadata upload status error exception: {error_string}"
+                "Metadata upload status error exception: %s", error_string
             )
             result.update(
                 {
@@ -193,10 +261,8 @@ class SumoFile:
                     ],
                 }
             )
-            pass
         except Exception as err:
-            err = err.with_traceback(None)
-            logger.warning(f"Metadata upload exception {err} {type(err)}")
+            logger.warning("Metadata upload exception: %r", err)
             result.update(
                 {
                     "status": "failed",
@@ -204,7 +270,22 @@ class SumoFile:
                     "metadata_upload_response_text": str(err),
                 }
             )
-            pass
+        else:
+            _t1_metadata = time.perf_counter_ns()
+            result.update(
+                {
+                    "metadata_upload_response_status_code": response.status_code,
+                    "metadata_upload_response_text": response.text,
+                    "metadata_upload_time_start": _t0_metadata / 1e9,
+                    "metadata_upload_time_end": _t1_metadata / 1e9,
+                    "metadata_upload_time_elapsed": (
+                        _t1_metadata - _t0_metadata
+                    )
+                    / 1e9,
+                    "metadata_file_path": self.metadata_path,
+                    "metadata_file_size": self._metadata_size,
+                }
+            )
 
         if result["metadata_upload_response_status_code"] not in [200, 201]:
             logger.warning(
@@ -213,22 +294,20 @@ class SumoFile:
             )
             return result
 
+        # Parse the response body once; json() re-decodes on each call
+        response_json = response.json()
         self.sumo_parent_id = sumo_parent_id
-        self.sumo_object_id = response.json().get("objectid")
+        self.sumo_object_id = response_json.get("objectid")
 
-        blob_url = response.json().get("blob_url")
+        blob_url = response_json.get("blob_url")
 
         # UPLOAD BLOB
 
-        _t0_blob = time.perf_counter()
+        _t0_blob = time.perf_counter_ns()
         upload_response = {}
 
-        if (
-            self.metadata.get("data")
-            and self.metadata.get("data").get("format")
-            and self.metadata.get("data").get("format") in ["openvds", "segy"]
-        ):
-            if sys.platform.startswith("darwin"):
+        if is_seismic:
+            if _IS_DARWIN:
                 # OpenVDS does not support Mac/darwin directly
                 # Outer code expects and interprets http error codes
                 upload_response.update(
@@ -246,10 +325,17 @@ class SumoFile:
                 cmd_str = _get_segyimport_cmdstr(
                     blob_url, self.sumo_object_id, self.path, sample_unit
                 )
+                # Deferred import: only SEGY uploads pay for it
+                import subprocess
+
                 try:
-                    cmd_result = subprocess.run(
-                        cmd_str, capture_output=True, text=True, shell=False
-                    )
+                    with _SEGY_SEMAPHORE:
+                        cmd_result = subprocess.run(
+                            cmd_str,
+                            capture_output=True,
+                            text=True,
+                            shell=False,
+                        )
                     if cmd_result.returncode == 0:
                         upload_response.update(
                             {
@@ -260,7 +346,7 @@ class SumoFile:
                     else:
                         # Outer code expects and interprets http error codes
                         logger.warning(
-                            "Seismic upload failed with returncode",
+                            "Seismic upload failed with returncode %s",
                             cmd_result.returncode,
                         )
                         upload_response.update(
@@ -270,13 +356,8 @@ class SumoFile:
                                 + cmd_result.stderr,
                             }
                         )
-                        pass
-                    pass
                 except Exception as err:
-                    err = err.with_traceback(None)
-                    logger.warning(
-                        f"Seismic upload exception {err} {type(err)}"
-                    )
+                    logger.warning("Seismic upload exception: %r", err)
                     upload_response.update(
                         {
                             "status_code": 418,
@@ -295,11 +376,9 @@ class SumoFile:
                         "text": response.text,
                     }
                 )
-                pass
             except (httpx.TimeoutException, httpx.ConnectError) as err:
-                err = err.with_traceback(None)
                 logger.warning(
-                    f"Blob upload failed on timeout/connect {err} {type(err)}"
+                    "Blob upload failed on timeout/connect: %r", err
                 )
                 upload_response.update(
                     {
@@ -310,11 +389,11 @@ class SumoFile:
                         "blob_upload_response_text": str(err),
                     }
                 )
-                pass
             except httpx.HTTPStatusError as err:
-                err = err.with_traceback(None)
                 logger.warning(
-                    f"Blob upload failed on status {err} {type(err)} {err.response.text}"
+                    "Blob upload failed on status %s: %s",
+                    err.response.status_code,
+                    err.response.text,
                 )
                 upload_response.update(
                     {
@@ -325,12 +404,8 @@ class SumoFile:
                         "blob_upload_response_text": err.response.reason_phrase,
                     }
                 )
-                pass
             except Exception as err:
-                err = err.with_traceback(None)
-                logger.warning(
-                    f"Blob upload failed on exception {err} {type(err)}"
-                )
+                logger.warning("Blob upload failed on exception: %r", err)
                 upload_response.update(
                     {
                         "status": "failed",
@@ -341,7 +416,7 @@ class SumoFile:
                     }
                 )
 
-        _t1_blob = time.perf_counter()
+        _t1_blob = time.perf_counter_ns()
 
         result.update(
             {
@@ -349,9 +424,9 @@ class SumoFile:
                     "status_code"
                 ],
                 "blob_upload_response_status_text": upload_response["text"],
-                "blob_upload_time_start": _t0_blob,
-                "blob_upload_time_end": _t1_blob,
-                "blob_upload_time_elapsed": _t1_blob - _t0_blob,
+                "blob_upload_time_start": _t0_blob / 1e9,
+                "blob_upload_time_end": _t1_blob / 1e9,
+                "blob_upload_time_elapsed": (_t1_blob - _t0_blob) / 1e9,
             }
         )
 
@@ -366,28 +441,29 @@ class SumoFile:
             self._delete_metadata(sumoclient, self.sumo_object_id)
         else:
             result["status"] = "ok"
+            # Failed uploads keep their payload so retries can resend;
+            # successful ones will not be sent again
+            self._release_byte_string()
             file_path = self.path
-            metadatafile_path = _path_to_yaml_path(file_path)
+            # The yaml path was resolved at construction; recomputing
+            # it here would also miss a custom metadata_path
+            metadatafile_path = self.metadata_path
             if sumo_mode.lower() == "move":
-                try:
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
+                # Unlink directly instead of stat-then-remove; a file
+                # that is already gone is not an error
+                for path in (file_path, metadatafile_path):
+                    try:
+                        os.unlink(path)
                         logger.debug(
                             "Deleted file after successful upload: %s",
-                            file_path,
+                            path,
                         )
-                    if os.path.exists(metadatafile_path):
-                        os.remove(metadatafile_path)
-                        logger.debug(
-                            "Deleted metadatafile after successful upload: %s",
-                            metadatafile_path,
+                    except FileNotFoundError:
+                        pass
+                    except OSError as err:
+                        warnings.warn(
+                            f"Error deleting file after upload: {err}"
                         )
-                except Exception as err:
-                    err = err.with_traceback(None)
-                    err_msg = (
-                        f"Error deleting file after upload: {err} {type(err)}"
-                    )
-                    warnings.warn(err_msg)
 
         return result
 
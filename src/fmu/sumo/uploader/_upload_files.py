@@ -4,22 +4,115 @@ The function that uploads files.
 
 """
 
+import functools
 import json
-from concurrent.futures import ThreadPoolExecutor
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from copy import deepcopy
 
-import yaml
+try:
+    # orjson serializes straight to bytes in C; optional dependency.
+    # NON_STR_KEYS matches stdlib json's coercion of e.g. int keys,
+    # and SERIALIZE_NUMPY tolerates numpy scalars in parameter dicts.
+    import orjson
+
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=_ORJSON_OPTS)
+
+except ImportError:
+
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
 
 from fmu.dataio._utils import read_parameters_txt
 from fmu.dataio.dataio import ExportData
+from fmu.sumo.uploader._fileondisk import parse_yaml
 from fmu.sumo.uploader._fileonjob import FileOnJob
 from fmu.sumo.uploader._logger import get_uploader_logger
+from fmu.sumo.uploader._md5_batch import batch_md5
 
 # pylint: disable=C0103 # allow non-snake case variable names
 
 
 logger = get_uploader_logger()
 
+# Confirmed "parameters already on Sumo" lookups, keyed on
+# (case uuid, realization uuid, blob_md5). Keying on the checksum means
+# an edited parameters.txt misses the cache and is searched (and
+# uploaded) again, while retry passes and realization-by-realization
+# pipelines skip the repeated remote query.
+_PARAMS_ON_SUMO = set()
+
+
+def prefetch_parameter_uploads(sumoclient, case_uuid, realization_ids):
+    """Warm the parameters cache for many realizations in one search.
+
+    Instead of one /search round trip per realization, a single query
+    covering all realization_ids seeds _PARAMS_ON_SUMO, so the
+    per-realization check in _upload_files is served locally.
+
+    Returns the set of realization uuids that already have a
+    parameters object on Sumo."""
+
+    if not realization_ids:
+        return set()
+
+    query = (
+        f"fmu.case.uuid:{case_uuid} AND data.content:parameters AND "
+        "fmu.realization.uuid:(" + " OR ".join(realization_ids) + ")"
+    )
+    search_res = sumoclient.get(
+        "/search",
+        {
+            "$query": query,
+            "$select": "fmu.realization.uuid,_sumo.blob_md5",
+            "$size": len(realization_ids),
+        },
+    ).json()
+
+    covered = set()
+    for hit in search_res["hits"]["hits"]:
+        source = hit["_source"]
+        realization_uuid = source["fmu"]["realization"]["uuid"]
+        covered.add(realization_uuid)
+        _PARAMS_ON_SUMO.add(
+            (
+                str(case_uuid),
+                realization_uuid,
+                source["_sumo"]["blob_md5"],
+            )
+        )
+    return covered
+
+
+@functools.lru_cache(maxsize=8)
+def _load_global_config(path, mtime_ns):
+    """Parse the fmu config yaml, cached on path and mtime.
+
+    The config is identical for every realization in a run, so one
+    parse per process is enough; an edited file changes mtime_ns and
+    misses the cache. parse_yaml additionally maintains a JSON sidecar
+    of the parsed document, so processes with a cold lru_cache (one
+    per forward-model job) skip the yaml parse too."""
+    return parse_yaml(path)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_parameters_export_data(path, mtime_ns):
+    """Return an ExportData for parameters, cached with its config.
+
+    ExportData.__init__ validates the whole global config, so building
+    it once per (path, mtime_ns) saves that validation on every later
+    call; only generate_metadata remains per-realization work."""
+    return ExportData(
+        config=_load_global_config(path, mtime_ns),
+        content="parameters",
+        name="parameters",
+    )
+
 
 def get_parameter_file(parameters_path, config_path):
     """Return a parameters object from the parameters.txt file
@@ -38,9 +131,19 @@ def get_parameter_file(parameters_path, config_path):
     bytestring = None
     metadata = None
 
+    # Cheapest check first: without a parameters.txt there is nothing
+    # to upload, so skip the config load and metadata generation
+    if not os.path.isfile(parameters_path):
+        logger.warning(
+            "No parameters file to read at %s, no file to upload.",
+            parameters_path,
+        )
+        return None
+
     try:
-        with open(config_path, "r", encoding="utf-8") as variables_yml:
-            global_config = yaml.safe_load(variables_yml)
+        exd = _get_parameters_export_data(
+            config_path, os.stat(config_path).st_mtime_ns
+        )
     except FileNotFoundError:
         logger.warning(
             "No fmu config to read at %s, cannot generate metadata to upload parameters",
@@ -57,17 +160,16 @@ def get_parameter_file(parameters_path, config_path):
         )
         return None
 
-    exd = ExportData(
-        config=global_config, content="parameters", name="parameters"
-    )
     metadata = exd.generate_metadata(parameters)
 
     if "fmu" not in metadata:
         logger.warning("No fmu section in metadata. Cannot upload parameters.")
         return None
 
-    bytestring = json.dumps(parameters).encode("utf-8")
+    bytestring = _dumps(parameters)
     paramfile = FileOnJob(bytestring, metadata)
+    # Hash immediately; blob_md5 is compared against Sumo below
+    paramfile.finalize_hash(batch_md5([bytestring])[0])
     paramfile.metadata_path = ""
     paramfile.path = ""
     paramfile.size = len(bytestring)
@@ -119,59 +221,99 @@ def _upload_files(
     sumo_mode="copy",
     config_path="fmuconfig/output/global_variables.yml",
     parameters_path="parameters.txt",
+    skip_parameters=False,
 ):
     """
     Upload realization and iteration objects if they do not exist
     Upload parameters file if it does not exist or it has changed
     Create threads and call _upload in each thread
+
+    skip_parameters elides the parameters handling entirely; callers
+    that already handled parameters in an earlier pass set it to avoid
+    repeating the config parse, metadata generation and remote search.
     """
 
-    for file in files:
-        if "fmu" in file.metadata and "realization" in file.metadata["fmu"]:
-            realization_id = file.metadata["fmu"]["realization"]["uuid"]
+    # Only the first file with a realization section matters; a plain
+    # lookup says so directly, where the old scan loop relied on an
+    # immediate break while appending to the list it iterated
+    realization_file = next(
+        (
+            file
+            for file in files
+            if "fmu" in file.metadata and "realization" in file.metadata["fmu"]
+        ),
+        None,
+    )
 
-            try:
-                maybe_upload_realization_and_iteration(
-                    sumoclient, file.metadata
-                )
-            except Exception as e:
-                logger.error(
-                    "Failed to upload realization and iteration objects: %s",
-                    e.with_traceback(None),
-                )
+    paramfile = None
+    if realization_file is not None:
+        realization_id = realization_file.metadata["fmu"]["realization"][
+            "uuid"
+        ]
 
+        try:
+            maybe_upload_realization_and_iteration(
+                sumoclient, realization_file.metadata
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to upload realization and iteration objects: %r",
+                e,
+            )
+
+        if not skip_parameters:
             paramfile = get_parameter_file(parameters_path, config_path)
-            if paramfile is not None:
+        if paramfile is not None:
+            cache_key = (
+                str(sumo_parent_id),
+                realization_id,
+                paramfile.metadata["_sumo"]["blob_md5"],
+            )
+            if cache_key in _PARAMS_ON_SUMO:
+                paramfile = None
+            else:
                 query = f"fmu.case.uuid:{sumo_parent_id} AND fmu.realization.uuid:{realization_id} AND data.content:parameters"
                 search_res = sumoclient.get(
-                    "/search", {"$query": query, "$select": "_sumo.blob_md5"}
+                    "/search",
+                    {"$query": query, "$select": "_sumo.blob_md5"},
                 ).json()
-                # Check if the parameters file does not exist or has changed
-                if (
+                # Only upload the parameters file if it does not
+                # exist on Sumo already or has changed
+                if not (
                     search_res["hits"]["total"]["value"] == 0
                     or search_res["hits"]["hits"][0]["_source"]["_sumo"][
                         "blob_md5"
                     ]
                     != paramfile.metadata["_sumo"]["blob_md5"]
                 ):
-                    files.append(paramfile)
+                    _PARAMS_ON_SUMO.add(cache_key)
+                    paramfile = None
 
-            break
+    if paramfile is not None:
+        # Concatenate rather than append; the caller's list is not ours
+        files = files + [paramfile]
 
-    with ThreadPoolExecutor(threads) as executor:
-        results = executor.map(
-            _upload_file,
-            [(file, sumoclient, sumo_parent_id, sumo_mode) for file in files],
-        )
+    # Bind the per-batch constants once instead of allocating an
+    # argument tuple per file
+    upload = functools.partial(
+        _upload_file,
+        sumoclient=sumoclient,
+        sumo_parent_id=sumo_parent_id,
+        sumo_mode=sumo_mode,
+    )
 
-    return results
+    with ThreadPoolExecutor(threads) as executor:
+        futures = [executor.submit(upload, file) for file in files]
+        # Yield in completion order; map would hold every finished
+        # result behind the slowest in-flight upload before it, keeping
+        # freed payloads pinned in the meantime
+        for future in as_completed(futures):
+            yield future.result()
 
 
-def _upload_file(args):
+def _upload_file(file, sumoclient, sumo_parent_id, sumo_mode):
     """Upload a file"""
 
-    file, sumoclient, sumo_parent_id, sumo_mode = args
-
     result = file.upload_to_sumo(
         sumoclient=sumoclient,
         sumo_parent_id=sumo_parent_id,
@@ -191,12 +333,15 @@ def upload_files(
     sumo_mode="copy",
     config_path="fmuconfig/output/global_variables.yml",
     parameters_path="parameters.txt",
+    skip_parameters=False,
 ):
     """
     Upload files
 
     files: list of FileOnDisk objects
     sumo_parent_id: sumo_parent_id for the parent case
+    skip_parameters: skip the parameters.txt handling; for callers
+        that already handled parameters in an earlier pass
 
     Upload is kept outside classes to use multithreading.
     """
@@ -209,12 +354,16 @@ def upload_files(
         sumo_mode,
         config_path,
         parameters_path,
+        skip_parameters,
     )
 
     ok_uploads = []
     failed_uploads = []
     rejected_uploads = []
 
+    # _upload_files yields as uploads complete, so each result is
+    # bucketed (and its file reference dropped where possible) without
+    # first materializing all of them
     for r in results:
         status = r.get("status")
 
@@ -224,9 +373,12 @@ def upload_files(
             )
 
         if status == "ok":
+            # Only failed uploads need the file object, for retries
+            r.pop("file", None)
             ok_uploads.append(r)
 
         elif status == "rejected":
+            r.pop("file", None)
             rejected_uploads.append(r)
 
         else:
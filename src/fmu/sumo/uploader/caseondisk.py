@@ -1,16 +1,17 @@
 """Objectify an FMU case (results) as it appears on the disk."""
 
+import fnmatch
 import glob
 import logging
 import os
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import httpx
-import yaml
 
-from fmu.sumo.uploader._fileondisk import FileOnDisk
+from fmu.sumo.uploader._fileondisk import FileOnDisk, parse_yaml
 from fmu.sumo.uploader._logger import get_uploader_logger
 from fmu.sumo.uploader._sumocase import SumoCase
 
@@ -18,6 +19,10 @@ logger = get_uploader_logger()
 
 # pylint: disable=C0103 # allow non-snake case variable names
 
+# Case uuids for which this process already created a shared access
+# key; re-registering such a case skips that round trip
+_SHARED_KEY_CREATED = set()
+
 
 class CaseOnDisk(SumoCase):
     """
@@ -78,6 +83,10 @@ class CaseOnDisk(SumoCase):
         self.verbosity = verbosity
         logger.setLevel(level=verbosity)
 
+        # Absolute paths already indexed; overlapping search strings
+        # across add_files calls must not parse or upload a file twice
+        self._indexed_paths = set()
+
         logger.debug("case metadata path: %s", case_metadata_path)
         self._case_metadata_path = Path(case_metadata_path)
         case_metadata = _load_case_metadata(case_metadata_path)
@@ -97,7 +106,7 @@ class CaseOnDisk(SumoCase):
         self._sumo_logger.info(
             "Initializing Sumo upload for case with sumo_parent_id: "
             + str(self._sumo_parent_id),
-            extra={"objectUuid": self._sumo_parent_id},
+            extra=self._log_extra,
         )
 
     def __str__(self):
@@ -111,7 +120,10 @@ class CaseOnDisk(SumoCase):
         return s
 
     def __repr__(self):
-        return str(self.__str__)
+        return (
+            f"{self.__class__.__name__}(files={len(self._files)}, "
+            f"sumo_parent_id={self._sumo_parent_id!r})"
+        )
 
     @property
     def sumo_parent_id(self):
@@ -128,20 +140,53 @@ class CaseOnDisk(SumoCase):
         """Return the files"""
         return self._files
 
-    def add_files(self, search_string):
+    def add_files(self, search_string, threads=4):
         """Add files to the case, based on search string"""
 
         logger.info("Searching for files at %s", search_string)
-        file_paths = _find_file_paths(search_string)
-
-        for file_path in file_paths:
+        file_paths = []
+        for file_path in _find_file_paths(search_string):
+            key = os.path.abspath(file_path)
+            if key in self._indexed_paths:
+                logger.info("Already indexed, skipping: %s", file_path)
+                continue
+            self._indexed_paths.add(key)
+            file_paths.append(file_path)
+
+        def _construct(file_path):
             try:
                 file = FileOnDisk(path=file_path, verbosity=self.verbosity)
-                self._files.append(file)
                 logger.info("File appended: %s", file_path)
-
+                return file
             except Exception as err:
-                warnings.warn(f"No metadata, skipping file: {err}")
+                # The warnings machinery walks the stack per call; in a
+                # per-file loop the logger is far cheaper
+                logger.warning("No metadata, skipping file: %s", err)
+                return None
+
+        # Construction reads and parses the sidecar yaml and the data
+        # file itself, so the loop is I/O-bound and pipelines well on
+        # threads; map preserves the discovery order
+        with ThreadPoolExecutor(threads) as executor:
+            constructed = list(executor.map(_construct, file_paths))
+
+        # Failed constructions stay unindexed so a later call can pick
+        # the file up again, e.g. once its metadata has been written
+        for file_path, file in zip(file_paths, constructed):
+            if file is None:
+                self._indexed_paths.discard(os.path.abspath(file_path))
+
+        files = [file for file in constructed if file is not None]
+        self._files.extend(files)
+
+        skipped = len(constructed) - len(files)
+        if skipped:
+            # One user-visible warning per call; per-file details are
+            # on the logger above
+            warnings.warn(
+                f"No metadata, skipping file: {skipped} file(s) skipped, "
+                "see log for details"
+            )
 
     def register(self):
         """Register this case on Sumo.
@@ -157,16 +202,28 @@ class CaseOnDisk(SumoCase):
             sumo_parent_id = self._upload_case_metadata(self.case_metadata)
             self._sumo_parent_id = sumo_parent_id
 
-            # Give Sumo some time to make the case object searchable.
-            time.sleep(3)
-
-            try:
-                self.sumoclient.create_shared_access_key_for_case(
-                    self._fmu_case_uuid
-                )
-            except Exception as ex:
-                logger.warn(f"Unable to create shared access key: {ex}")
-                pass
+            # Poll until Sumo has made the case object searchable;
+            # a fixed sleep taxed every registration with its
+            # worst-case wait. The backoff caps out near the old
+            # 3 seconds, but most environments index the case within
+            # the first probe.
+            for delay in (0.05, 0.1, 0.2, 0.4, 0.8, 1.6):
+                try:
+                    self.sumoclient.get(f"/objects('{sumo_parent_id}')")
+                    break
+                except httpx.HTTPError:
+                    time.sleep(delay)
+
+            if self._fmu_case_uuid not in _SHARED_KEY_CREATED:
+                try:
+                    self.sumoclient.create_shared_access_key_for_case(
+                        self._fmu_case_uuid
+                    )
+                    _SHARED_KEY_CREATED.add(self._fmu_case_uuid)
+                except Exception as ex:
+                    logger.warning(
+                        "Unable to create shared access key: %s", ex
+                    )
 
             logger.info("Case registered. SumoID: {}".format(sumo_parent_id))
 
@@ -220,9 +277,9 @@ def _load_case_metadata(case_metadata_path: str):
         return {}
 
     try:
-        with open(case_metadata_path, "r") as stream:
-            yaml_data = yaml.safe_load(stream)
-        return yaml_data
+        # parse_yaml maintains a JSON sidecar of the parsed document,
+        # so warm invocations skip the yaml parse entirely
+        return parse_yaml(case_metadata_path)
     except Exception:
         warnings.warn(f"Invalid metadata in yml file {case_metadata_path}")
         return {}
@@ -231,7 +288,40 @@ def _load_case_metadata(case_metadata_path: str):
 def _find_file_paths(search_string):
     """Find files and return as list of FileOnDisk instances."""
 
-    files = [f for f in glob.glob(search_string) if os.path.isfile(f)]
+    dir_name, base_pattern = os.path.split(search_string)
+    if (
+        glob.has_magic(base_pattern)
+        and not glob.has_magic(dir_name)
+        # ** must recurse; fnmatch would treat it like a plain *
+        and "**" not in base_pattern
+    ):
+        # Wildcards only in the basename: one scandir pass suffices.
+        # DirEntry.is_file answers from the directory listing, where
+        # glob + os.path.isfile stats every candidate path twice.
+        try:
+            with os.scandir(dir_name or ".") as entries:
+                files = [
+                    # entry.path would prefix "./" on bare patterns
+                    # like "*.bin", which glob does not
+                    entry.path if dir_name else entry.name
+                    for entry in entries
+                    # glob hides dotfiles unless asked for explicitly
+                    if (entry.name[0] != "." or base_pattern[0] == ".")
+                    and fnmatch.fnmatch(entry.name, base_pattern)
+                    and entry.is_file()
+                ]
+        except OSError:
+            files = []
+    else:
+        # iglob streams matches instead of building an intermediate
+        # list, and recursive=True makes ** patterns work. The isfile
+        # check (one stat) only runs on this fallback path; it is what
+        # keeps directories out of the result.
+        files = [
+            f
+            for f in glob.iglob(search_string, recursive=True)
+            if os.path.isfile(f)
+        ]
 
     if len(files) == 0:
         warnings.warn("No files found! Please, check the search string.")
@@ -6,6 +6,10 @@ from ert import (
     ForwardModelStepValidationError,
 )
 
+# Sumo environments this process has already logged in to silently;
+# ERT validates every SUMO_UPLOAD step, but one check per env suffices
+_LOGIN_OK_ENVS = set()
+
 
 class SumoUpload(ForwardModelStepPlugin):
     def __init__(self):
@@ -42,8 +46,13 @@ class SumoUpload(ForwardModelStepPlugin):
         self, fm_step_json: ForwardModelStepJSON
     ) -> None:
         env = fm_step_json["argList"][2]
-        command = f"sumo_login -e {env} -m silent"
-        return_code = subprocess.call(command, shell=True)
+        if env in _LOGIN_OK_ENVS:
+            return
+
+        # Argument-list form skips the intermediate shell fork
+        return_code = subprocess.call(
+            ["sumo_login", "-e", env, "-m", "silent"]
+        )
 
         err_msg = (
             "Your config uses Sumo, please authenticate"
@@ -53,3 +62,5 @@ class SumoUpload(ForwardModelStepPlugin):
 
         if return_code != 0:
             raise ForwardModelStepValidationError(err_msg)
+
+        _LOGIN_OK_ENVS.add(env)
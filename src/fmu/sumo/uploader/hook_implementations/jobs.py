@@ -1,3 +1,4 @@
+import functools
 import importlib
 import os
 import sys
@@ -9,19 +10,27 @@ from ert.shared.plugins.plugin_response import plugin_response
 from fmu.sumo.uploader.forward_models import SumoUpload
 
 
+@functools.cache
 def _get_jobs_from_directory(directory):
     """Do a filesystem lookup in a directory to check
-    for available ERT forward models"""
+    for available ERT forward models
+
+    The installed job files cannot change within a process, and ERT
+    invokes the plugin hooks repeatedly during config load, so the
+    directory is only scanned once."""
     resource_directory = (
         Path(sys.modules["fmu.sumo.uploader"].__file__).parent / directory
     )
 
-    all_files = [
-        os.path.join(resource_directory, f)
-        for f in os.listdir(resource_directory)
-        if os.path.isfile(os.path.join(resource_directory, f))
-    ]
-    return {os.path.basename(path): path for path in all_files}
+    # DirEntry carries the name, the joined path and the file-type bit
+    # from one directory read; the listdir variant joined each path
+    # twice and re-statted it for the isfile check
+    with os.scandir(resource_directory) as entries:
+        return {
+            entry.name: entry.path
+            for entry in entries
+            if entry.is_file(follow_symlinks=False)
+        }
 
 
 # pylint: disable=no-value-for-parameter
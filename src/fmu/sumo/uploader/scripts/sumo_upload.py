@@ -144,9 +144,10 @@ def sumo_upload_main(
             config_path,
             parameters_path,
         )
-        # add files to the case on disk object
+        # add files to the case on disk object; discovery and metadata
+        # parsing use the same worker count as the upload itself
         logger.info("Adding files. Search path is %s", searchpath)
-        e.add_files(searchpath)
+        e.add_files(searchpath, threads=threads)
         logger.info("%s files has been added", str(len(e.files)))
 
         if len(e.files) == 0:
@@ -0,0 +1,190 @@
+"""Offline unit tests; no Sumo connection or access token needed."""
+
+import base64
+import glob
+import hashlib
+import os
+
+import pytest
+import yaml
+
+from fmu.sumo.uploader._fileondisk import parse_yaml
+from fmu.sumo.uploader._md5_batch import batch_md5
+from fmu.sumo.uploader.caseondisk import CaseOnDisk, _find_file_paths
+
+
+def _write_file_pair(directory, name, content, metadata=None):
+    """Write a data file and its FMU metadata sidecar, return the path."""
+    path = directory / name
+    path.write_bytes(content)
+    sidecar = directory / f".{name}.yml"
+    if metadata is None:
+        metadata = {"data": {"name": name}}
+    sidecar.write_text(yaml.safe_dump(metadata))
+    return path
+
+
+class TestBatchMd5:
+    def test_digests_match_hashlib(self):
+        payloads = [b"", b"x", b"payload" * 1000, os.urandom(4096)]
+        digests = batch_md5(payloads)
+        for payload, digest in zip(payloads, digests):
+            assert digest == hashlib.md5(payload).digest()
+
+    def test_order_is_preserved(self):
+        payloads = [str(i).encode() for i in range(100)]
+        assert batch_md5(payloads) == [
+            hashlib.md5(p).digest() for p in payloads
+        ]
+
+    def test_digest_is_base64_encodable(self):
+        # _sumo.blob_md5 is the base64 encoding of the raw digest
+        (digest,) = batch_md5([b"hello"])
+        assert (
+            base64.b64encode(digest).decode("ascii")
+            == "XUFAKrxLKna5cZ2REBfFkg=="
+        )
+
+
+class TestParseYaml:
+    def test_returns_parsed_document(self, tmp_path):
+        path = tmp_path / "meta.yml"
+        path.write_text("fmu:\n  case:\n    name: mycase\n")
+        assert parse_yaml(path) == {"fmu": {"case": {"name": "mycase"}}}
+
+    def test_datetimes_are_cached_as_isoformat(self, tmp_path):
+        # FMU metadata contains unquoted timestamps, which yaml parses
+        # into datetime objects; those must not break the JSON sidecar
+        path = tmp_path / "meta.yml"
+        path.write_text(
+            "tracklog:\n"
+            "- datetime: 2020-01-02T03:04:05\n"
+            "masterdata:\n"
+            "  date: 2020-01-02\n"
+        )
+        cold = parse_yaml(path)
+        assert cold["tracklog"][0]["datetime"] == "2020-01-02T03:04:05"
+        assert cold["masterdata"]["date"] == "2020-01-02"
+        # The sidecar was written and no tmp litter remains
+        assert os.path.isfile(f"{path}.json")
+        assert glob.glob(f"{tmp_path}/*.tmp") == []
+
+    def test_warm_load_equals_cold_load(self, tmp_path):
+        path = tmp_path / "meta.yml"
+        path.write_text("data:\n  name: somefile\n  t: 2021-12-31\n")
+        cold = parse_yaml(path)
+        assert os.path.isfile(f"{path}.json")
+        warm = parse_yaml(path)
+        assert warm == cold
+
+    def test_non_string_keys_are_not_cached(self, tmp_path):
+        # json.dump would coerce the integer keys to strings, so the
+        # warm result would differ from the cold one; such documents
+        # must bypass the sidecar cache entirely
+        path = tmp_path / "global_variables.yml"
+        path.write_text("zones:\n  1: upper\n  2: lower\n")
+        cold = parse_yaml(path)
+        assert cold == {"zones": {1: "upper", 2: "lower"}}
+        assert not os.path.isfile(f"{path}.json")
+        assert parse_yaml(path) == cold
+
+    def test_stale_cache_is_not_served(self, tmp_path):
+        path = tmp_path / "meta.yml"
+        path.write_text("version: 1\n")
+        assert parse_yaml(path) == {"version": 1}
+        # Rewrite with the same mtime; the size component of the key
+        # must invalidate the sidecar
+        stat = os.stat(path)
+        path.write_text("version: 22\n")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert parse_yaml(path) == {"version": 22}
+
+
+class TestFindFilePaths:
+    @pytest.fixture
+    def case_dir(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.bin").write_text("a")
+        (tmp_path / "b.bin").write_text("b")
+        (tmp_path / "c.txt").write_text("c")
+        (tmp_path / ".hidden.bin").write_text("h")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "d.bin").write_text("d")
+        return tmp_path
+
+    def test_flat_pattern(self, case_dir):
+        assert sorted(_find_file_paths("*.bin")) == ["a.bin", "b.bin"]
+
+    def test_directory_qualified_pattern(self, case_dir):
+        assert _find_file_paths("sub/*.bin") == [os.path.join("sub", "d.bin")]
+
+    def test_dotfiles_hidden_unless_asked_for(self, case_dir):
+        assert ".hidden.bin" not in _find_file_paths("*.bin")
+        assert _find_file_paths(".*.bin") == [".hidden.bin"]
+
+    def test_directories_are_not_returned(self, case_dir):
+        assert "sub" not in _find_file_paths("*")
+
+    def test_double_star_basename_recurses(self, case_dir):
+        found = _find_file_paths(f"{case_dir}/**")
+        assert str(case_dir / "sub" / "d.bin") in found
+
+    def test_double_star_pattern_recurses(self, case_dir):
+        assert sorted(_find_file_paths("**/*.bin")) == [
+            "a.bin",
+            "b.bin",
+            os.path.join("sub", "d.bin"),
+        ]
+
+    def test_matches_glob_semantics(self, case_dir):
+        for pattern in ("*.bin", "*", "sub/*", ".*.bin"):
+            assert sorted(_find_file_paths(pattern)) == sorted(
+                f for f in glob.glob(pattern) if os.path.isfile(f)
+            )
+
+    def test_warns_when_nothing_found(self, case_dir):
+        with pytest.warns(UserWarning, match="No files found"):
+            assert _find_file_paths("*.nosuch") == []
+
+
+class TestAddFiles:
+    @pytest.fixture
+    def case(self):
+        """A CaseOnDisk with just the state add_files needs, so no
+        case metadata or Sumo connection is involved."""
+        case = object.__new__(CaseOnDisk)
+        case.verbosity = "WARNING"
+        case._files = []
+        case._indexed_paths = set()
+        return case
+
+    def test_adds_files_with_metadata(self, case, tmp_path):
+        _write_file_pair(tmp_path, "surface.bin", b"1234")
+        case.add_files(f"{tmp_path}/*.bin")
+        assert len(case.files) == 1
+        assert case.files[0].byte_string == b"1234"
+
+    def test_overlapping_searches_do_not_duplicate(self, case, tmp_path):
+        _write_file_pair(tmp_path, "surface.bin", b"1234")
+        case.add_files(f"{tmp_path}/*.bin")
+        case.add_files(f"{tmp_path}/surface.*")
+        assert len(case.files) == 1
+
+    def test_files_without_metadata_warn_once(self, case, tmp_path):
+        _write_file_pair(tmp_path, "surface.bin", b"1234")
+        (tmp_path / "bare1.bin").write_text("x")
+        (tmp_path / "bare2.bin").write_text("y")
+        with pytest.warns(UserWarning, match="2 file"):
+            case.add_files(f"{tmp_path}/*.bin")
+        assert len(case.files) == 1
+
+    def test_skipped_files_are_retried_on_next_call(self, case, tmp_path):
+        path = tmp_path / "late.bin"
+        path.write_text("x")
+        with pytest.warns(UserWarning):
+            case.add_files(f"{tmp_path}/*.bin")
+        assert case.files == []
+        # Metadata arrives later; a new search must pick the file up
+        _write_file_pair(tmp_path, "late.bin", b"x")
+        case.add_files(f"{tmp_path}/*.bin")
+        assert len(case.files) == 1